@@ -1,5 +1,11 @@
 import json
-from typing import Any, Dict, List, Tuple
+import re
+import sys
+from array import array
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Collection, Deque, Dict, List, Tuple
 
 import streamlit as st
 import streamlit.components.v1 as components
@@ -11,17 +17,50 @@ try:
 except Exception:
     HAS_SVN = False
 
+# --- Optional dependency: orjson (faster parse/serialize, falls back to json)
+try:
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+
 
 # ------------------------------
 # Helpers
 # ------------------------------
 
+# orjson silently turns integers past 64 bits into floats, so a document with
+# a run of 20+ digits (anywhere, strings included) goes straight to json.
+_LONG_DIGITS = re.compile(rb"\d{20,}")
+
+
+def _loads(payload: bytes) -> Any:
+    if HAS_ORJSON and not _LONG_DIGITS.search(payload):
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # orjson rejects some input json accepts (NaN/Infinity); let
+            # json parse it or report the error.
+            pass
+    return json.loads(payload)
+
+
+def _dumps(obj: Any) -> str:
+    if HAS_ORJSON:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+
 def _truncate(s: str, max_len: int = 80) -> str:
     return (s[: max_len - 1] + "…") if len(s) > max_len else s
 
 
-def _value_preview(v: Any) -> str:
-    if isinstance(v, (int, float, bool)) or v is None:
+def _preview_fallback(v: Any) -> str:
+    # Subclasses and non-JSON values; parsed JSON never gets here.
+    if isinstance(v, (int, float)):
         return json.dumps(v)
     if isinstance(v, str):
         return _truncate(v.replace("\n", " "))
@@ -32,163 +71,210 @@ def _value_preview(v: Any) -> str:
     return str(v)
 
 
-def build_network(
-    data: Any,
-    *,
-    show_values: bool = True,
-    max_nodes: int = 1200,
-) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool]:
-    """Walk an arbitrary JSON-like structure and return vis-network nodes/edges.
+# Parsed JSON only ever contains these exact types, so one dict lookup on
+# type(v) replaces the chain of type checks.
+_PREVIEW = {
+    int: json.dumps,
+    float: json.dumps,
+    bool: json.dumps,
+    type(None): lambda v: "null",
+    str: lambda v: _truncate(v.replace("\n", " ")),
+    list: lambda v: f"[{len(v)}]",
+    dict: lambda v: "{…}",
+}
 
-    Uses **sequential integer ids** for nodes (safer for some wrappers).
 
-    Returns: nodes, edges, truncated
-    """
-    nodes: List[Dict[str, Any]] = []
-    edges: List[Dict[str, Any]] = []
-    truncated = False
-
-    path_to_id: Dict[str, int] = {}
-    next_id = 1
-
-    def add_node(path: str, label: str, group: str) -> int | None:
-        nonlocal next_id, truncated
-        if path in path_to_id:
-            return path_to_id[path]
-        if len(nodes) >= max_nodes:
-            truncated = True
-            return None
-        nid = next_id
-        next_id += 1
-        path_to_id[path] = nid
-        node: Dict[str, Any] = {"id": nid, "label": label}
-        node["group"] = group
-        nodes.append(node)
-        return nid
+# Primitive types whose previews are worth memoizing. The type is part of the
+# cache key so that 1, 1.0 and True (which compare equal) stay distinct.
+_CACHEABLE = frozenset((int, float, bool, str, type(None)))
 
-    def walk(obj: Any, path: str, parent_nid: int | None) -> None:
-        nonlocal truncated
-        if truncated:
-            return
-        if isinstance(obj, dict):
-            label = (path.split(".")[-1] if path else "root") + " {}"
-            nid = add_node(path or "root", label, "object")
-            if nid is None:
-                return
-            if parent_nid is not None:
-                edges.append({"from": parent_nid, "to": nid})
-            for k, v in obj.items():
-                child_path = f"{path + '.' if path else ''}{k}"
-                walk(v, child_path, nid)
-        elif isinstance(obj, list):
-            label = (path.split(".")[-1] if path else "root") + f" [{len(obj)}]"
-            nid = add_node(path or "root", label, "array")
-            if nid is None:
-                return
-            if parent_nid is not None:
-                edges.append({"from": parent_nid, "to": nid})
-            for i, v in enumerate(obj):
-                child_path = f"{path}[{i}]" if path else f"[{i}]"
-                walk(v, child_path, nid)
-        else:
-            label = _value_preview(obj) if show_values else type(obj).__name__
-            nid = add_node(path, label, "value")
-            if nid is None:
-                return
-            if parent_nid is not None:
-                edges.append({"from": parent_nid, "to": nid})
 
-    walk(data, path="", parent_nid=None)
-    return nodes, edges, truncated
+@lru_cache(maxsize=4096)
+def _cached_preview(t: type, v: Any) -> str:
+    return _PREVIEW[t](v)
 
 
-# ------------------------------
-# UI
-# ------------------------------
-st.set_page_config(page_title="JSON Structure Viewer", layout="wide")
+def _value_preview(v: Any) -> str:
+    t = type(v)
+    if t in _CACHEABLE and (t is not str or len(v) < 256):
+        return _cached_preview(t, v)
+    return _PREVIEW.get(t, _preview_fallback)(v)
 
-st.title("🔎 JSON Structure Viewer")
 
-with st.sidebar:
-    st.header("Input")
-    file = st.file_uploader("Upload a JSON file", type=["json"])  # noqa: F841
-    pasted = st.text_area("…or paste JSON here", height=140, placeholder='{"name":"Alice","items":[{"sku":1},{"sku":2}]}')
+# vis-network group names, shared by every node of that kind.
+_GROUP_OBJ, _GROUP_ARR, _GROUP_VAL = map(sys.intern, ("object", "array", "value"))
 
-    st.header("Display options")
-    show_values = st.toggle("Show value previews", value=True, help="When on, labels include short previews of primitive values.")
-    max_nodes = st.slider("Max nodes (safety)", min_value=100, max_value=5000, value=1500, step=100)
 
-    st.subheader("Tree view")
-    tree_width = st.slider("Tree width (px)", 500, 1600, 900)
-    tree_height = st.slider("Tree height (px)", 300, 1000, 600)
-    initial_depth = st.slider("Initial expand depth", 0, 4, 1)
-    max_children = st.slider("Max children per node", 10, 1000, 200, step=10, help="Limits very wide arrays/objects to keep the tree usable.")
+# A node's location in the document: dict keys (str) and list indices (int).
+JsonPath = Tuple[Any, ...]
 
-    st.subheader("Bubble view")
-    bubble_height = st.slider("Bubble view height (px)", 300, 900, 520)
-    bubble_width = st.slider("Bubble view width (px)", 400, 1400, 900)
-    st.caption("If the graph doesn't render, try reducing width or nodes, or use the Test graph below.")
 
-# Read data
-data: Any | None = None
-err = None
-if file is not None:
-    try:
-        data = json.load(file)
-    except Exception as e:
-        err = f"Failed to parse uploaded JSON: {e}"
-elif pasted.strip():
-    try:
-        data = json.loads(pasted)
-    except Exception as e:
-        err = f"Failed to parse pasted JSON: {e}"
+def build_network(
+    data: Any,
+    *,
+    show_values: bool = True,
+    max_nodes: int = 1200,
+    expanded: Collection[JsonPath] | None = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool, List[JsonPath | None]]:
+    """Walk an arbitrary JSON-like structure and return vis-network nodes/edges.
 
-if err:
-    st.error(err)
+    Uses **sequential integer ids** for nodes (safer for some wrappers), assigned
+    in breadth-first order, so a truncated graph keeps the top of the document.
 
-# Example data fallback
-if data is None:
-    data = {
-        "example": True,
-        "items": [
-            {"id": 1, "name": "Vitamin C", "tags": ["supplement", "immune"]},
-            {"id": 2, "name": "Magnesium", "strength": {"amount": 250, "unit": "mg"}},
-        ],
-        "meta": {"source": "sample", "count": 2},
-    }
-    st.info("No JSON provided. Using a small example so you can see the views.")
+    If ``expanded`` is given, only the root and the containers whose paths are
+    in it have their children walked; other containers are leaf nodes until
+    the UI expands them.
 
-# Views
-raw_tab, tree_tab, bubble_tab = st.tabs(["Raw JSON", "Tree view (collapsible)", "Bubble view (graph)"])
+    Returns: nodes, edges, truncated, paths (``paths[id - 1]`` is a container's
+    path, ``None`` for value nodes)
+    """
+    # Nodes and edges are collected column-wise and only turned into
+    # vis-network dicts once at the end; node ``i`` (0-based) gets id ``i + 1``.
+    labels: List[str] = []
+    groups: List[str] = []
+    # Only containers can be parents, so only they get a name (used for their
+    # children's labels) and a path (used for expansion); value nodes get None.
+    names: List[str | None] = []
+    paths: List[JsonPath | None] = []
+    edges_from = array("i")
+    edges_to = array("i")
+
+    # Every path is visited exactly once (each child's path extends its
+    # parent's), so ids can just be handed out in order without a lookup.
+    labels_append = labels.append
+    groups_append = groups.append
+    names_append = names.append
+    paths_append = paths.append
+    intern = sys.intern
+    from_append = edges_from.append
+    to_append = edges_to.append
+
+    def add_node(
+        label: str, group: str, parent_nid: int | None, name: str | None = None, path: JsonPath | None = None
+    ) -> int:
+        labels_append(label)
+        groups_append(group)
+        names_append(name)
+        paths_append(path)
+        nid = len(labels)
+        if parent_nid is not None:
+            from_append(parent_nid)
+            to_append(nid)
+        return nid
 
-with raw_tab:
-    st.subheader("Raw JSON")
-    st.json(data)
+    # Breadth-first with an explicit queue and a node budget: a container only
+    # enqueues as many children as the budget has left, so nothing beyond
+    # ``max_nodes`` is ever queued and every queued entry becomes a node.
+    # Entries carry just the child's key and parent id; the name and path are
+    # derived from the parent's only if the child turns out to be a container.
+    truncated = max_nodes < 1
+    budget = max_nodes - 1  # nodes that may still be queued after the root
+    queue: Deque[Tuple[Any, Any, int | None]] = deque([(data, None, None)] if max_nodes > 0 else ())
+    popleft = queue.popleft
+    extend = queue.extend
+    while queue:
+        obj, key, parent_nid = popleft()
+        t = type(obj)
+        if t is dict or t is list:
+            if parent_nid is None:
+                name, path = "", ()
+            else:
+                # A container is named by its key, plus the indices of any
+                # lists it sits in below that key ("items[0]").
+                name = key if type(key) is str else f"{names[parent_nid - 1]}[{key}]"
+                path = paths[parent_nid - 1] + (key,)
+            n = len(obj) if expanded is None or not path or path in expanded else 0
+            take = n if n <= budget else budget
+            budget -= take
+            truncated = truncated or take < n
+            # Container labels repeat across uniform records ("strength {}"), so
+            # intern them to share one string per distinct label.
+            if t is dict:
+                nid = add_node(intern((name or "root") + " {}"), _GROUP_OBJ, parent_nid, name, path)
+                extend((v, k, nid) for k, v in islice(obj.items(), take))
+            else:
+                nid = add_node(intern(f"{name or 'root'} [{len(obj)}]"), _GROUP_ARR, parent_nid, name, path)
+                extend((v, i, nid) for i, v in enumerate(islice(obj, take)))
+        else:
+            label = _value_preview(obj) if show_values else t.__name__
+            add_node(label, _GROUP_VAL, parent_nid)
 
-with tree_tab:
-    st.subheader("Collapsible tree")
+    nodes = [
+        {"id": nid, "label": label, "group": group}
+        for nid, (label, group) in enumerate(zip(labels, groups), 1)
+    ]
+    edges = [{"from": f, "to": t} for f, t in zip(edges_from, edges_to)]
+    return nodes, edges, truncated, paths
 
-    # --- Build a D3-friendly tree structure ---
-    def to_d3_tree(obj: Any, name: str = "root", depth: int = 0) -> Dict[str, Any]:
-        if isinstance(obj, dict):
-            children = []
-            for i, (k, v) in enumerate(list(obj.items())[:max_children]):
-                children.append(to_d3_tree(v, str(k), depth + 1))
-            return {"name": name, "children": children}
-        if isinstance(obj, list):
-            children = []
-            for i, v in enumerate(obj[:max_children]):
-                children.append(to_d3_tree(v, f"[{i}]", depth + 1))
-            return {"name": f"{name} [{len(obj)}]", "children": children}
-        # primitive
-        label = f"{name}: {_value_preview(obj)}" if show_values else f"{name}: {type(obj).__name__}"
-        return {"name": label}
-
-    tree_data = to_d3_tree(data, "root")
 
-    # --- Render with an embedded D3 collapsible tree ---
-    container_id = "d3tree"  # static is fine in Streamlit component iframe
-    html = """
+def layered_layout(
+    nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]], *, dx: int = 120, dy: int = 40
+) -> List[Dict[str, Any]]:
+    """Return copies of build_network ``nodes`` placed in a left-to-right layered layout.
+
+    Relies on the breadth-first ids: node ``k``'s parent is ``edges[k - 2]["from"]``,
+    so each node's depth and its position within that depth come from one pass.
+    """
+    depth = [0] * (len(nodes) + 1)
+    per_depth: List[int] = []
+    out: List[Dict[str, Any]] = []
+    for node in nodes:
+        nid = node["id"]
+        d = depth[edges[nid - 2]["from"]] + 1 if nid > 1 else 0
+        depth[nid] = d
+        if d == len(per_depth):
+            per_depth.append(0)
+        out.append({**node, "x": d * dx, "y": per_depth[d] * dy})
+        per_depth[d] += 1
+    return out
+
+
+def _cap_children(data: Any, max_children: int, show_values: bool) -> Any:
+    """Encode ``data`` for the tree view, keeping the first ``max_children`` entries of each container.
+
+    Values become their label text (preview or type name), lists become
+    ``{"n": full length, "c": [children]}`` and dicts become lists of
+    ``[key, child]`` entries. Entry lists keep key order and keys such as
+    ``__proto__`` that a JS object literal would mangle, and no number has
+    to survive a trip through a JS double.
+    """
+    def cap(obj: Any) -> Any:
+        t = type(obj)
+        if t is dict:
+            return [[k, cap(v)] for k, v in islice(obj.items(), max_children)]
+        if t is list:
+            return {"n": len(obj), "c": [cap(v) for v in islice(obj, max_children)]}
+        return _value_preview(obj) if show_values else t.__name__
+
+    return cap(data)
+
+
+# Streamlit reruns the whole script on every widget change. Parsing and the
+# builders are cached on the raw JSON bytes (dicts/lists aren't hashable) plus
+# their flags, so moving e.g. a size slider doesn't reparse or rewalk the document.
+#
+# The parsed document uses cache_resource: cache_data would unpickle a fresh
+# deep copy on every hit, which costs about as much as parsing again. Every
+# rerun therefore shares one object, so callers must treat it as read-only
+# (st.json and build_network only read it, as with _EXAMPLE_DATA).
+@st.cache_resource(ttl=600, max_entries=8, show_spinner=False)
+def _parse_json(payload: bytes) -> Any:
+    return _loads(payload)
+
+
+@st.cache_data(ttl=600, max_entries=8, show_spinner=False)
+def _cached_network(
+    payload: bytes, show_values: bool, max_nodes: int, expanded: Tuple[JsonPath, ...] | None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool, List[JsonPath | None]]:
+    return build_network(
+        _parse_json(payload),
+        show_values=show_values,
+        max_nodes=max_nodes,
+        expanded=None if expanded is None else frozenset(expanded),
+    )
+
+
+_TREE_HTML = """
     <!doctype html>
     <html>
     <head>
@@ -204,7 +290,17 @@ with tree_tab:
     <body>
       <div id=\"d3tree\"></div>
       <script>
-        const data = __DATA__;
+        // The document arrives capped and labelled by _cap_children (values
+        // are label strings, lists {n, c}, dicts [key, child] entries) and is
+        // turned into the {name, children} shape d3.hierarchy expects here.
+        const raw = __DATA__;
+
+        function toD3(obj, name) {
+          if (typeof obj === 'string') return {name: `${name}: ${obj}`};
+          if (Array.isArray(obj)) return {name: name, children: obj.map(([k, v]) => toD3(v, k))};
+          return {name: `${name} [${obj.n}]`, children: obj.c.map((v, i) => toD3(v, `[${i}]`))};
+        }
+        const data = toD3(raw, 'root');
         const width = __WIDTH__;
         const outerH = __HEIGHT__;
         const dx = 20, dy = 180;
@@ -289,15 +385,228 @@ with tree_tab:
       </script>
     </body>
     </html>
-    """
-
-    html = (html
-            .replace("__DATA__", json.dumps(tree_data))
-            .replace("__WIDTH__", str(tree_width))
-            .replace("__HEIGHT__", str(tree_height))
+"""
+
+
+# Cached so reruns with unchanged inputs skip re-capping and re-encoding the
+# document; the page itself comes out the same either way.
+@st.cache_data(ttl=600, max_entries=8, show_spinner=False)
+def _tree_html(
+    payload: bytes, width: int, height: int, initial_depth: int, show_values: bool, max_children: int
+) -> str:
+    return (_TREE_HTML
+            .replace("__WIDTH__", str(width))
+            .replace("__HEIGHT__", str(height))
             .replace("__INIT_DEPTH__", str(initial_depth))
+            # last, so document text can't be mistaken for a placeholder;
+            # "</" is escaped so a string value can't close the <script> tag
+            .replace("__DATA__", _dumps(_cap_children(_parse_json(payload), max_children, show_values))
+                     .replace("</", "<\\/"))
             )
 
+
+# Shown when no JSON has been provided. Built once at import (and never mutated)
+# so the fallback reuses the same bytes, and therefore the same cache entries,
+# on every rerun.
+_EXAMPLE_DATA: Dict[str, Any] = {
+    "example": True,
+    "items": [
+        {"id": 1, "name": "Vitamin C", "tags": ["supplement", "immune"]},
+        {"id": 2, "name": "Magnesium", "strength": {"amount": 250, "unit": "mg"}},
+    ],
+    "meta": {"source": "sample", "count": 2},
+}
+_EXAMPLE_JSON = json.dumps(_EXAMPLE_DATA).encode("utf-8")
+
+
+_BUBBLE_HELP_MD = """
+- Drag nodes to rearrange
+- Scroll to zoom
+- Click to select a node/edge (selection shown below)
+- With *Expand on click* on, clicking an object/array node expands its children
+"""
+
+
+# The bubble view ships the graph to the component in chunks of this many nodes;
+# "Load more" adds another chunk.
+BUBBLE_CHUNK = 500
+# Beyond this many nodes the browser's force simulation dominates render time,
+# so physics is switched off and nodes are placed with layered_layout instead.
+BUBBLE_PHYSICS_MAX = 800
+
+
+# The graph component keeps returning its last selection, so both resets bump
+# a generation that is part of its key: the new component starts unselected.
+def _new_bubble_graph() -> None:
+    st.session_state["bubble_gen"] = st.session_state.get("bubble_gen", 0) + 1
+
+
+def _reset_bubble_view() -> None:
+    st.session_state["bubble_chunks"] = 1
+    st.session_state["bubble_expanded"] = set()
+    _new_bubble_graph()
+
+
+def _collapse_bubble_view() -> None:
+    st.session_state["bubble_expanded"] = set()
+    _new_bubble_graph()
+
+
+def _load_more_bubble_chunks() -> None:
+    st.session_state["bubble_chunks"] = st.session_state.get("bubble_chunks", 1) + 1
+
+
+# ------------------------------
+# UI
+# ------------------------------
+st.set_page_config(page_title="JSON Structure Viewer", layout="wide")
+
+st.title("🔎 JSON Structure Viewer")
+
+with st.sidebar:
+    st.header("Input")
+    file = st.file_uploader("Upload a JSON file", type=["json"], on_change=_reset_bubble_view)  # noqa: F841
+    pasted = st.text_area("…or paste JSON here", height=140, placeholder='{"name":"Alice","items":[{"sku":1},{"sku":2}]}',
+                          on_change=_reset_bubble_view)
+
+    st.header("Display options")
+    show_values = st.toggle("Show value previews", value=True, help="When on, labels include short previews of primitive values.")
+    max_nodes = st.slider("Max nodes (safety)", min_value=100, max_value=5000, value=1500, step=100)
+
+    st.subheader("Tree view")
+    tree_width = st.slider("Tree width (px)", 500, 1600, 900)
+    tree_height = st.slider("Tree height (px)", 300, 1000, 600)
+    initial_depth = st.slider("Initial expand depth", 0, 4, 1)
+    max_children = st.slider("Max children per node", 10, 1000, 200, step=10, help="Limits very wide arrays/objects to keep the tree usable.")
+
+    st.subheader("Bubble view")
+    bubble_height = st.slider("Bubble view height (px)", 300, 900, 520)
+    bubble_width = st.slider("Bubble view width (px)", 400, 1400, 900)
+    bubble_lazy = st.toggle("Expand on click", value=True,
+                            help="Start with the root's children and expand objects/arrays by clicking them. "
+                                 "Turn off to walk the whole document up to the node limit.")
+    st.caption("If the graph doesn't render, try reducing width or nodes, or use the Test graph below.")
+
+# Read data (the raw bytes are kept as the cache key for the views)
+data: Any | None = None
+payload: bytes | None = None
+err = None
+if file is not None:
+    try:
+        raw = file.getvalue()
+        data = _parse_json(raw)
+        payload = raw
+    except Exception as e:
+        err = f"Failed to parse uploaded JSON: {e}"
+elif pasted.strip():
+    try:
+        raw = pasted.encode("utf-8")
+        data = _parse_json(raw)
+        payload = raw
+    except Exception as e:
+        err = f"Failed to parse pasted JSON: {e}"
+
+if err:
+    st.error(err)
+
+# Example data fallback
+if data is None:
+    data = _EXAMPLE_DATA
+    payload = _EXAMPLE_JSON
+    st.info("No JSON provided. Using a small example so you can see the views.")
+
+# Streamlit >= 1.37: widgets inside the bubble view (load more, clicks, the test
+# graph) rerun only this function, not the parse/tree/raw views around it.
+@st.fragment
+def _bubble_view(payload: bytes, show_values: bool, max_nodes: int, lazy: bool, height: int, width: int) -> None:
+    # Quick sanity test button to isolate component issues
+    with st.expander("Test the component", expanded=False):
+        if st.button("Render tiny test graph"):
+            test_nodes = [{"id": 1, "label": "A"}, {"id": 2, "label": "B"}]
+            test_edges = [{"from": 1, "to": 2, "label": "A→B"}]
+            _ = streamlit_vis_network(test_nodes, test_edges, height=320, width=600)
+            st.success("If you can see A—B above, the component is working.")
+
+    # On-demand expansion: only the containers the user has clicked are walked.
+    # A click is applied before the graph is built, against the paths of the
+    # graph it was made in, so no extra rerun is needed. Expanding only adds
+    # nodes after the clicked one's level, so re-applying the same selection on
+    # later reruns is a no-op.
+    expanded: set = st.session_state.setdefault("bubble_expanded", set())
+    graph_key = f"bubble_graph_{st.session_state.setdefault('bubble_gen', 0)}"
+    selection = st.session_state.get(graph_key)
+    newly_expanded: set = set()
+    if selection and lazy:
+        prev_paths = st.session_state.get("bubble_paths", [])
+        newly_expanded = {
+            prev_paths[nid - 1]
+            for nid in selection[0]
+            if type(nid) is int and 0 < nid <= len(prev_paths) and prev_paths[nid - 1] is not None
+        } - expanded
+        expanded |= newly_expanded
+    nodes, edges, truncated, node_paths = _cached_network(
+        payload, show_values, max_nodes, tuple(sorted(expanded, key=repr)) if lazy else None
+    )
+    st.session_state["bubble_paths"] = node_paths
+
+    # Ids are breadth-first and node k's only incoming edge is edges[k - 2],
+    # so a prefix of the nodes is a connected graph with a prefix of the edges.
+    # A newly expanded container's children are numbered after everything
+    # already on its level, so widen the window by whole chunks to include them.
+    if newly_expanded:
+        last = max((e["to"] for e in edges if node_paths[e["from"] - 1] in newly_expanded), default=0)
+        st.session_state["bubble_chunks"] = max(st.session_state.get("bubble_chunks", 1), -(-last // BUBBLE_CHUNK))
+    shown = min(len(nodes), st.session_state.setdefault("bubble_chunks", 1) * BUBBLE_CHUNK)
+    hidden = sum(1 for e in edges[max(shown - 1, 0):] if node_paths[e["from"] - 1] in expanded) if lazy else 0
+
+    st.caption(
+        f"Nodes: {len(nodes)} | Edges: {len(edges)}" + (" | Truncated" if truncated else "")
+        + (f" | {hidden} children of expanded nodes are past the first {shown} (load more to see them)" if hidden else "")
+    )
+
+    if not nodes:
+        st.error("No nodes to render. Paste/upload some JSON in the sidebar, or lower the max nodes limit.")
+    else:
+        # Hint about interaction
+        with st.expander("What can I do here?", expanded=False):
+            st.markdown(_BUBBLE_HELP_MD)
+
+        view_nodes, view_edges = nodes[:shown], edges[:shown - 1]
+        options: Dict[str, Any] = {}
+        if shown > BUBBLE_PHYSICS_MAX:
+            view_nodes = layered_layout(view_nodes, view_edges)
+            options = {"physics": {"enabled": False}}
+        selection = streamlit_vis_network(
+            view_nodes, view_edges, options=options, height=height, width=width, key=graph_key
+        )
+        if shown < len(nodes):
+            st.button(f"Load more nodes (showing {shown} of {len(nodes)})", on_click=_load_more_bubble_chunks)
+        if lazy and expanded:
+            st.button("Collapse all", on_click=_collapse_bubble_view)
+        if selection:
+            selected_nodes, selected_edges, positions = selection
+            col1, col2 = st.columns(2)
+            with col1:
+                st.write("**Selected nodes**", selected_nodes)
+                st.write("**Selected edges**", selected_edges)
+            with col2:
+                if st.toggle("Show node positions"):
+                    st.write(positions)
+
+
+# Views
+raw_tab, tree_tab, bubble_tab = st.tabs(["Raw JSON", "Tree view (collapsible)", "Bubble view (graph)"])
+
+with raw_tab:
+    st.subheader("Raw JSON")
+    st.json(data)
+
+with tree_tab:
+    st.subheader("Collapsible tree")
+
+    # --- Render with an embedded D3 collapsible tree ---
+    html = _tree_html(payload, tree_width, tree_height, initial_depth, show_values, max_children)
+
     components.html(html, height=tree_height, scrolling=True)
 
 with bubble_tab:
@@ -309,36 +618,4 @@ with bubble_tab:
             "Tip: pip install streamlit-vis-network | Import name: from streamlit_vis_network import streamlit_vis_network"
         )
     else:
-        # Quick sanity test button to isolate component issues
-        with st.expander("Test the component", expanded=False):
-            if st.button("Render tiny test graph"):
-                test_nodes = [{"id": 1, "label": "A"}, {"id": 2, "label": "B"}]
-                test_edges = [{"from": 1, "to": 2, "label": "A→B"}]
-                _ = streamlit_vis_network(test_nodes, test_edges, height=320, width=600)
-                st.success("If you can see A—B above, the component is working.")
-
-        nodes, edges, truncated = build_network(data, show_values=show_values, max_nodes=max_nodes)
-
-        st.caption(f"Nodes: {len(nodes)} | Edges: {len(edges)}" + (" | Truncated" if truncated else ""))
-
-        if not nodes:
-            st.error("No nodes to render. Paste/upload some JSON in the sidebar, or lower the max nodes limit.")
-        else:
-            # Hint about interaction
-            with st.expander("What can I do here?", expanded=False):
-                st.markdown("""
-- Drag nodes to rearrange
-- Scroll to zoom
-- Click to select a node/edge (selection shown below)
-""")
-
-            selection = streamlit_vis_network(nodes, edges, height=bubble_height, width=bubble_width)
-            if selection:
-                selected_nodes, selected_edges, positions = selection
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.write("**Selected nodes**", selected_nodes)
-                    st.write("**Selected edges**", selected_edges)
-                with col2:
-                    if st.toggle("Show node positions"):
-                        st.write(positions)
+        _bubble_view(payload, show_values, max_nodes, bubble_lazy, bubble_height, bubble_width)